@@ -1,11 +1,14 @@
 # app.py
 import os
 import io
+import gzip
+import json
+import mimetypes
 from datetime import datetime
 from zoneinfo import ZoneInfo
 from flask import (
     Flask, request, jsonify, render_template,
-    redirect, url_for, session, send_file
+    redirect, url_for, session, send_file, send_from_directory, abort
 )
 import firebase_admin
 from firebase_admin import credentials, firestore
@@ -57,6 +60,86 @@ def inject_now_year():
     return {"now_year": datetime.now(ZoneInfo(TZ)).year}
 
 
+# ============================
+# ASSETS versionados y precomprimidos (generados con build_assets.py)
+# ============================
+ASSETS_DIST = os.path.join(app.root_path, "static", "dist")
+ASSETS_MAX_AGE = 365 * 24 * 3600  # el hash cambia con el contenido
+ASSETS_MANIFEST = os.path.join(ASSETS_DIST, "manifest.json")
+_manifest_cache = {"mtime": None, "data": {}}
+
+
+def cargar_manifest():
+    # se recarga si build_assets.py se ejecuta con el servidor en marcha
+    try:
+        mtime = os.path.getmtime(ASSETS_MANIFEST)
+    except OSError:
+        return {}
+    if mtime != _manifest_cache["mtime"]:
+        with open(ASSETS_MANIFEST, encoding="utf-8") as f:
+            _manifest_cache["data"] = json.load(f)
+        _manifest_cache["mtime"] = mtime
+    return _manifest_cache["data"]
+
+
+@app.context_processor
+def inject_asset_url():
+    def asset_url(filename):
+        # sin build (desarrollo) se sirve el archivo original desde /static
+        versionado = cargar_manifest().get(filename)
+        if versionado:
+            return url_for("assets", filename=versionado)
+        return url_for("static", filename=filename)
+    return {"asset_url": asset_url}
+
+
+@app.route("/assets/<path:filename>")
+def assets(filename):
+    # el manifest y las variantes comprimidas no se piden directamente
+    if filename == "manifest.json" or filename.endswith((".gz", ".br", ".tmp")):
+        abort(404)
+
+    mimetype = mimetypes.guess_type(filename)[0] or "application/octet-stream"
+    encoding = None
+    servir = filename
+    for enc, ext in (("br", ".br"), ("gzip", ".gz")):
+        if request.accept_encodings[enc] > 0 and \
+                os.path.isfile(os.path.join(ASSETS_DIST, filename + ext)):
+            encoding = enc
+            servir = filename + ext
+            break
+
+    resp = send_from_directory(ASSETS_DIST, servir, mimetype=mimetype)
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    # send_file pondría "filename=...css.gz"; el contenido es el asset original
+    resp.headers.pop("Content-Disposition", None)
+    resp.vary.add("Accept-Encoding")
+    # solo los nombres del manifest actual llevan hash garantizado
+    if filename in cargar_manifest().values():
+        resp.headers["Cache-Control"] = f"public, max-age={ASSETS_MAX_AGE}, immutable"
+    return resp
+
+
+# ============================
+# Util: respuesta JSON comprimida con gzip si el cliente lo acepta
+# ============================
+def jsonify_comprimido(payload, min_size=500):
+    resp = jsonify(payload)
+    resp.vary.add("Accept-Encoding")
+    if request.accept_encodings["gzip"] > 0 and resp.content_length >= min_size:
+        resp.set_data(gzip.compress(resp.get_data(), compresslevel=6))
+        resp.headers["Content-Encoding"] = "gzip"
+    return resp
+
+
+# ============================
+# Util: número entero si no tiene decimales (JSON más corto)
+# ============================
+def numero(v):
+    return int(v) if float(v).is_integer() else float(v)
+
+
 # ============================
 # LOGIN (root -> login)
 # ============================
@@ -286,6 +369,8 @@ def report_page():
 @app.route("/api/report/annual")
 def api_report_annual():
     year = int(request.args.get("year", datetime.now(ZoneInfo(TZ)).year))
+    # format=compact -> columnas (listas por paralelo, índice 0 = enero)
+    compacto = request.args.get("format") == "compact"
 
     # Recolectar students map ci -> (curso, paralelo)
     students_docs = db.collection("students").stream()
@@ -347,6 +432,36 @@ def api_report_annual():
         if ci:
             estudiantes_por_clave.setdefault(clave, set()).add(ci)
 
+    if compacto:
+        # mismo orden que "detalle" (jsonify ordena sus claves)
+        claves = sorted(por_paralelo)
+        paid_students_count = []
+        paid_amount = []
+        not_paid_count = []
+        students_count = []
+        for clave in claves:
+            cnt_students = len(estudiantes_por_clave.get(clave, set()))
+            pagos_mes = pagos_por_clave_mes.get(clave, {})
+            montos_mes = pagos_amount_por_clave_mes.get(clave, {})
+            pagados = [len(pagos_mes.get(m, set())) for m in range(1, 13)]
+            students_count.append(cnt_students)
+            paid_students_count.append(pagados)
+            paid_amount.append([numero(montos_mes.get(m, 0.0)) for m in range(1, 13)])
+            not_paid_count.append([max(0, cnt_students - n) for n in pagados])
+
+        return jsonify_comprimido({
+            "total": numero(total),
+            "paralelos": claves,
+            "totales": [numero(por_paralelo[k]) for k in claves],
+            "students_count": students_count,
+            "paid_students_count": paid_students_count,
+            "paid_amount": paid_amount,
+            "not_paid_count": not_paid_count,
+            "por_mes": [numero(por_mes.get(m, 0)) for m in range(1, 13)],
+            # pagos sin mes válido (en el formato extendido: por_mes["0"])
+            "sin_mes": numero(por_mes.get(0, 0))
+        })
+
     # construir detalle final con estructura rica
     detalle_extendido = {}
     for clave, monto in por_paralelo.items():
@@ -367,10 +482,10 @@ def api_report_annual():
         }
 
     # detalle_sumario para la UI (clave -> total)
-    detalle_sumario = {k: int(v) if float(v).is_integer() else float(v) for k, v in por_paralelo.items()}
+    detalle_sumario = {k: numero(v) for k, v in por_paralelo.items()}
 
-    return jsonify({
-        "total": int(total) if float(total).is_integer() else float(total),
+    return jsonify_comprimido({
+        "total": numero(total),
         "detalle": detalle_sumario,
         "detalle_extendido": detalle_extendido,
         "por_mes": por_mes
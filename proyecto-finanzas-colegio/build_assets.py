@@ -0,0 +1,95 @@
+# build_assets.py
+# Genera los assets estáticos para producción:
+#   - copia con hash de contenido en el nombre (css/style.3f2a9c1b.css)
+#   - versiones precomprimidas .gz y .br
+#   - logo optimizado
+#   - static/dist/manifest.json con el mapeo original -> versionado
+#
+# Requiere: pip install Pillow brotli
+# Uso: python build_assets.py
+#
+# Los archivos de builds anteriores no se borran: la app recarga el manifest
+# cuando cambia, y las páginas ya cacheadas siguen pidiendo los nombres viejos.
+import os
+import sys
+import io
+import json
+import gzip
+import hashlib
+
+try:
+    import brotli
+    from PIL import Image
+except ImportError as e:
+    sys.exit(f"Falta dependencia para el build: {e.name} (pip install Pillow brotli)")
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, "static")
+DIST_DIR = os.path.join(STATIC_DIR, "dist")
+MANIFEST_PATH = os.path.join(DIST_DIR, "manifest.json")
+
+# Archivos que se sirven desde las plantillas
+ASSETS = ["css/style.css", "img/logo.png"]
+
+# Solo vale la pena comprimir formatos de texto (PNG ya está comprimido)
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt")
+
+# El logo se muestra como máximo a 180px (dashboard); 2x para pantallas retina
+LOGO_MAX_PX = 360
+
+
+def optimizar_logo(data):
+    img = Image.open(io.BytesIO(data))
+    img.thumbnail((LOGO_MAX_PX, LOGO_MAX_PX), Image.LANCZOS)
+    out = io.BytesIO()
+    img.save(out, format="PNG", optimize=True)
+    optimizado = out.getvalue()
+    return optimizado if len(optimizado) < len(data) else data
+
+
+def nombre_versionado(rel_path, data):
+    digest = hashlib.sha256(data).hexdigest()[:8]
+    base, ext = os.path.splitext(rel_path)
+    return f"{base}.{digest}{ext}"
+
+
+def escribir(path, data):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(data)
+
+
+def build():
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    manifest = {}
+    for rel in ASSETS:
+        with open(os.path.join(STATIC_DIR, rel), "rb") as f:
+            data = f.read()
+        original = len(data)
+
+        if rel == "img/logo.png":
+            data = optimizar_logo(data)
+
+        versionado = nombre_versionado(rel, data)
+        destino = os.path.join(DIST_DIR, versionado)
+        escribir(destino, data)
+
+        if rel.endswith(COMPRESSIBLE):
+            # mtime=0 para que el .gz sea reproducible entre builds
+            escribir(destino + ".gz", gzip.compress(data, compresslevel=9, mtime=0))
+            escribir(destino + ".br", brotli.compress(data, quality=11))
+
+        manifest[rel] = versionado
+        print(f"{rel} -> dist/{versionado} ({original} -> {len(data)} bytes)")
+
+    # escribir y renombrar: la app nunca lee un manifest a medio escribir
+    tmp = MANIFEST_PATH + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp, MANIFEST_PATH)
+    print(f"Manifest: {MANIFEST_PATH}")
+
+
+if __name__ == "__main__":
+    build()
@@ -0,0 +1,276 @@
+# test_app.py
+# Pruebas con el cliente de Flask; Firestore se reemplaza por un stub en memoria.
+# Uso: python -m pytest test_app.py
+import os
+import io
+import gzip
+import json
+import hashlib
+
+import pytest
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+os.environ.setdefault("FIREBASE_CREDS", os.path.join(BASE_DIR, "serviceAccountKey.json"))
+
+import app as app_module  # noqa: E402
+
+CSS = b"body { color: #0b1e39; }\n" * 40
+
+
+@pytest.fixture
+def client():
+    app_module.app.config["TESTING"] = True
+    return app_module.app.test_client()
+
+
+# ============================
+# Stub de Firestore: collection().where(...).stream()
+# ============================
+class FakeDoc:
+    def __init__(self, data):
+        self._data = data
+
+    def to_dict(self):
+        return dict(self._data)
+
+
+class FakeQuery:
+    def __init__(self, rows, filtros=()):
+        self.rows = rows
+        self.filtros = filtros
+
+    def where(self, campo, op, valor):
+        assert op == "=="
+        return FakeQuery(self.rows, self.filtros + ((campo, valor),))
+
+    def stream(self):
+        for r in self.rows:
+            if all(r.get(c) == v for c, v in self.filtros):
+                yield FakeDoc(r)
+
+
+class FakeDB:
+    def __init__(self, **colecciones):
+        self.colecciones = colecciones
+
+    def collection(self, nombre):
+        return FakeQuery(self.colecciones.get(nombre, []))
+
+
+STUDENTS = [
+    {"ci": "1", "curso": "1ro", "paralelo": "A"},
+    {"ci": "2", "curso": "1ro", "paralelo": "A"},
+    {"ci": "3", "curso": "2do", "paralelo": "B"},
+]
+
+PAYMENTS = [
+    # 2do B aparece primero en los pagos; "paralelos" igual sale ordenado
+    {"student_ci": "3", "curso": "2do", "paralelo": "B", "month": 12, "year": 2025, "amount": 500},
+    {"student_ci": "1", "curso": "1ro", "paralelo": "A", "month": 1, "year": 2025, "amount": 500},
+    {"student_ci": "2", "curso": "1ro", "paralelo": "A", "month": 1, "year": 2025, "amount": 500},
+    {"student_ci": "1", "curso": "1ro", "paralelo": "A", "month": 2, "year": 2025, "amount": 250.5},
+    {"student_ci": "1", "curso": "1ro", "paralelo": "A", "month": 3, "year": 2024, "amount": 500},
+    # pago sin mes: va a por_mes["0"] / sin_mes
+    {"student_ci": "3", "curso": "2do", "paralelo": "B", "year": 2025, "amount": 100},
+]
+
+
+@pytest.fixture
+def db(monkeypatch):
+    fake = FakeDB(students=STUDENTS, payments=PAYMENTS)
+    monkeypatch.setattr(app_module, "db", fake)
+    return fake
+
+
+# ============================
+# REPORTE ANUAL
+# ============================
+def test_report_compacto(client, db):
+    data = client.get("/api/report/annual?year=2025&format=compact").get_json()
+
+    assert data["total"] == 1850.5
+    assert data["paralelos"] == ["1ro A", "2do B"]
+    assert data["totales"] == [1250.5, 600]
+    assert data["students_count"] == [2, 1]
+    # índice 0 = enero, índice 11 = diciembre
+    assert data["paid_students_count"][0][:3] == [2, 1, 0]
+    assert data["paid_amount"][0][:3] == [1000, 250.5, 0]
+    assert data["not_paid_count"][0][:3] == [0, 1, 2]
+    assert data["paid_students_count"][1][11] == 1
+    assert data["not_paid_count"][1] == [1] * 11 + [0]
+    assert data["por_mes"][0] == 1000
+    assert data["por_mes"][11] == 500
+    assert data["sin_mes"] == 100
+    assert sum(data["por_mes"]) + data["sin_mes"] == data["total"]
+    assert all(len(fila) == 12 for fila in data["paid_amount"])
+
+
+def test_report_compacto_igual_al_extendido(client, db):
+    compacto = client.get("/api/report/annual?year=2025&format=compact").get_json()
+    extendido = client.get("/api/report/annual?year=2025").get_json()
+
+    assert compacto["total"] == extendido["total"]
+    assert compacto["paralelos"] == list(extendido["detalle"])
+    assert dict(zip(compacto["paralelos"], compacto["totales"])) == extendido["detalle"]
+    for i, clave in enumerate(compacto["paralelos"]):
+        det = extendido["detalle_extendido"][clave]
+        assert compacto["students_count"][i] == det["students_count"]
+        for m in range(1, 13):
+            mes = det["months"][str(m)]
+            assert compacto["paid_students_count"][i][m - 1] == mes["paid_students_count"]
+            assert compacto["paid_amount"][i][m - 1] == mes["paid_amount"]
+            assert compacto["not_paid_count"][i][m - 1] == mes["not_paid_count"]
+    for m in range(1, 13):
+        assert compacto["por_mes"][m - 1] == extendido["por_mes"][str(m)]
+    assert compacto["sin_mes"] == extendido["por_mes"]["0"]
+
+
+# ============================
+# RESPUESTA COMPRIMIDA
+# ============================
+def test_jsonify_comprimido_gzip():
+    payload = {"x": list(range(500))}
+    with app_module.app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        resp = app_module.jsonify_comprimido(payload)
+    assert resp.headers["Content-Encoding"] == "gzip"
+    assert "Accept-Encoding" in resp.headers["Vary"]
+    assert json.loads(gzip.decompress(resp.get_data())) == payload
+
+
+def test_jsonify_comprimido_bajo_min_size():
+    with app_module.app.test_request_context(headers={"Accept-Encoding": "gzip"}):
+        resp = app_module.jsonify_comprimido({"x": 1})
+    assert "Content-Encoding" not in resp.headers
+    assert resp.get_json() == {"x": 1}
+
+
+def test_jsonify_comprimido_sin_accept_encoding():
+    payload = {"x": list(range(500))}
+    with app_module.app.test_request_context():
+        resp = app_module.jsonify_comprimido(payload)
+    assert "Content-Encoding" not in resp.headers
+    assert resp.get_json() == payload
+
+
+# ============================
+# ASSETS
+# ============================
+@pytest.fixture
+def dist(tmp_path, monkeypatch):
+    css_dir = tmp_path / "css"
+    css_dir.mkdir()
+    (css_dir / "style.abc12345.css").write_bytes(CSS)
+    (css_dir / "style.abc12345.css.gz").write_bytes(gzip.compress(CSS))
+    (tmp_path / "manifest.json").write_text(json.dumps({"css/style.css": "css/style.abc12345.css"}))
+
+    monkeypatch.setattr(app_module, "ASSETS_DIST", str(tmp_path))
+    monkeypatch.setattr(app_module, "ASSETS_MANIFEST", str(tmp_path / "manifest.json"))
+    monkeypatch.setitem(app_module._manifest_cache, "mtime", None)
+    return tmp_path
+
+
+def test_asset_url_usa_manifest(dist):
+    with app_module.app.test_request_context():
+        asset_url = app_module.inject_asset_url()["asset_url"]
+        assert asset_url("css/style.css") == "/assets/css/style.abc12345.css"
+        assert asset_url("img/logo.png") == "/static/img/logo.png"
+
+
+def test_asset_gzip(client, dist):
+    r = client.get("/assets/css/style.abc12345.css", headers={"Accept-Encoding": "gzip"})
+    assert r.status_code == 200
+    assert r.headers["Content-Encoding"] == "gzip"
+    assert r.headers["Content-Type"].startswith("text/css")
+    assert "Content-Disposition" not in r.headers
+    assert "immutable" in r.headers["Cache-Control"]
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert gzip.decompress(r.data) == CSS
+
+
+def test_asset_sin_compresion(client, dist):
+    r = client.get("/assets/css/style.abc12345.css")
+    assert r.status_code == 200
+    assert "Content-Encoding" not in r.headers
+    assert r.headers["Content-Type"].startswith("text/css")
+    assert "Content-Disposition" not in r.headers
+    assert "immutable" in r.headers["Cache-Control"]
+    assert "Accept-Encoding" in r.headers["Vary"]
+    assert r.data == CSS
+
+
+def test_asset_fuera_del_manifest_sin_immutable(client, dist):
+    (dist / "css" / "otro.css").write_bytes(CSS)
+    r = client.get("/assets/css/otro.css")
+    assert r.status_code == 200
+    assert "immutable" not in r.headers.get("Cache-Control", "")
+
+
+@pytest.mark.parametrize("ruta", [
+    "/assets/manifest.json",
+    "/assets/css/style.abc12345.css.gz",
+    "/assets/css/style.abc12345.css.br",
+])
+def test_asset_rutas_internas_404(client, dist, ruta):
+    (dist / "css" / "style.abc12345.css.br").write_bytes(b"br")
+    assert client.get(ruta, headers={"Accept-Encoding": "gzip, br"}).status_code == 404
+
+
+# ============================
+# BUILD DE ASSETS
+# ============================
+@pytest.fixture
+def build_env(tmp_path, monkeypatch):
+    pytest.importorskip("brotli")
+    Image = pytest.importorskip("PIL.Image")
+    import build_assets
+
+    static = tmp_path / "static"
+    (static / "css").mkdir(parents=True)
+    (static / "img").mkdir()
+    (static / "css" / "style.css").write_bytes(CSS)
+    # ruido: el PNG grande no se comprime solo, el reducido sí pesa menos
+    logo = Image.frombytes("RGB", (800, 600), os.urandom(800 * 600 * 3))
+    logo.save(static / "img" / "logo.png")
+
+    dist = static / "dist"
+    monkeypatch.setattr(build_assets, "STATIC_DIR", str(static))
+    monkeypatch.setattr(build_assets, "DIST_DIR", str(dist))
+    monkeypatch.setattr(build_assets, "MANIFEST_PATH", str(dist / "manifest.json"))
+    return build_assets, static, dist
+
+
+def test_build_assets(build_env):
+    import brotli
+    from PIL import Image
+    build_assets, static, dist = build_env
+
+    build_assets.build()
+    manifest = json.loads((dist / "manifest.json").read_text())
+    assert set(manifest) == {"css/style.css", "img/logo.png"}
+
+    css = manifest["css/style.css"]
+    assert css == f"css/style.{hashlib.sha256(CSS).hexdigest()[:8]}.css"
+    assert (dist / css).read_bytes() == CSS
+    assert gzip.decompress((dist / (css + ".gz")).read_bytes()) == CSS
+    assert brotli.decompress((dist / (css + ".br")).read_bytes()) == CSS
+
+    logo_data = (dist / manifest["img/logo.png"]).read_bytes()
+    digest = hashlib.sha256(logo_data).hexdigest()[:8]
+    assert manifest["img/logo.png"] == f"img/logo.{digest}.png"
+    assert max(Image.open(io.BytesIO(logo_data)).size) <= build_assets.LOGO_MAX_PX
+    assert not (dist / (manifest["img/logo.png"] + ".gz")).exists()
+
+
+def test_build_assets_conserva_builds_anteriores(build_env):
+    build_assets, static, dist = build_env
+
+    build_assets.build()
+    anterior = json.loads((dist / "manifest.json").read_text())["css/style.css"]
+
+    (static / "css" / "style.css").write_bytes(CSS + b"a { color: red; }\n")
+    build_assets.build()
+    nuevo = json.loads((dist / "manifest.json").read_text())["css/style.css"]
+
+    assert nuevo != anterior
+    for nombre in (anterior, anterior + ".gz", anterior + ".br", nuevo):
+        assert (dist / nombre).exists()